@@ -9,7 +9,6 @@ import subprocess
 from pathlib import Path
 from typing import Tuple
 from codeflow.file import get_context
-from codeflow.token_profiler import profile_code_context, generate_flamegraph
 import click
 import logging
 import tempfile
@@ -52,6 +51,9 @@ def cli(paths: Tuple[str, ...], pbcopy: bool, raw: bool, extension: Tuple[str, .
     # Load context documents from current directory
     try:
         if profile or flamegraph:
+            # Only needed for --profile/--flamegraph; token_profiler loads tiktoken lazily itself
+            from codeflow.token_profiler import profile_code_context, generate_flamegraph
+
             logger.debug(f"Profiling code context for {path_list}") 
             output_content, profile_data = profile_code_context(path_list, raw, extension)
             logger.debug(f"Profile complete")
@@ -75,15 +77,15 @@ def cli(paths: Tuple[str, ...], pbcopy: bool, raw: bool, extension: Tuple[str, .
                 logger.debug(f"Flame graph generated at: {flamegraph_path}")
                 click.echo(f"Flame graph generated at: {flamegraph_path}")
                 
-                # Open the file in Chrome
+                # Open the file in Chrome without waiting for the browser to exit
                 try:
                     system = platform.system()
                     if system == "Darwin":  # macOS
-                        subprocess.run(["open", "-a", "Google Chrome", flamegraph_path])
+                        subprocess.Popen(["open", "-a", "Google Chrome", flamegraph_path])
                     elif system == "Linux":
-                        subprocess.run(["google-chrome", flamegraph_path])
+                        subprocess.Popen(["google-chrome", flamegraph_path])
                     elif system == "Windows":
-                        subprocess.run(["chrome", flamegraph_path], shell=True)
+                        subprocess.Popen(["chrome", flamegraph_path], shell=True)
                     else:
                         click.echo(f"Flame graph saved but couldn't auto-open browser on {system}.")
                 except Exception as e:
@@ -6,10 +6,15 @@ with special handling for READMEs and support for both XML and raw output format
 """
 
 import os
+import stat
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
-from typing import List, Set, Optional, Tuple, Union
+from typing import Dict, Iterator, List, Set, Optional, Tuple, Union
 import fnmatch
+import re
 from dataclasses import dataclass
+from operator import attrgetter
 import logging 
 
 logger = logging.getLogger(__name__)
@@ -22,6 +27,59 @@ class Document:
     content: str
     is_readme: bool = False
 
+# Suffixes of files that never belong in a code context
+_BINARY_EXTENSIONS = frozenset({
+    '.pyc', '.pyo', '.pyd', '.so', '.dll', '.dylib',
+    '.exe', '.bin', '.pkl', '.pickle', '.wandb',
+    '.zip', '.tar', '.gz', '.jpg', '.png', '.gif'
+})
+_DATA_EXTENSIONS = frozenset({'.log', '.txt'})
+
+# Bytes inspected when sniffing file contents for binary data
+_BINARY_SNIFF_BYTES = 4096
+
+# Thread pool sizing for reading files in _load_files_batch
+_READ_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+_PARALLEL_READ_THRESHOLD = 8
+
+# Path kinds returned by _stat_kind
+_MISSING, _FILE, _DIR, _OTHER = range(4)
+
+# Stat results memoized for the duration of a get_context call; None otherwise
+_stat_cache: Optional[Dict[str, int]] = None
+
+@contextmanager
+def _stat_cache_scope() -> Iterator[None]:
+    """Memoize _stat_kind results until the block exits."""
+    global _stat_cache
+    _stat_cache = {}
+    try:
+        yield
+    finally:
+        _stat_cache = None
+
+def _stat_kind(path: Union[str, Path]) -> int:
+    """Classify a path as missing, file, directory or other with a single stat."""
+    key = os.fspath(path)
+    if _stat_cache is not None and key in _stat_cache:
+        return _stat_cache[key]
+
+    try:
+        mode = os.stat(key).st_mode
+    except (OSError, ValueError):
+        kind = _MISSING
+    else:
+        if stat.S_ISDIR(mode):
+            kind = _DIR
+        elif stat.S_ISREG(mode):
+            kind = _FILE
+        else:
+            kind = _OTHER
+
+    if _stat_cache is not None:
+        _stat_cache[key] = kind
+    return kind
+
 
 def resolve_codebase_path(path_str: Union[str, Path]) -> Path:
     """
@@ -33,14 +91,9 @@ def resolve_codebase_path(path_str: Union[str, Path]) -> Path:
     Returns:
         Resolved absolute path
     """
-    path_obj = Path(str(path_str))
-    
-    # If path is absolute, just return it
-    if path_obj.is_absolute():
-        return path_obj.resolve()
-    
-    # All relative paths are resolved against current working directory
-    return (Path.cwd() / path_obj).resolve()
+    # resolve() makes relative paths absolute against the current working
+    # directory itself, so no separate Path.cwd() lookup is needed
+    return Path(path_str).resolve()
 
 def _find_git_root(start_path: Path) -> Optional[Path]:
     """
@@ -52,11 +105,11 @@ def _find_git_root(start_path: Path) -> Optional[Path]:
     Returns:
         Path to git root directory, or None if not in a git repo
     """
-    current = start_path if start_path.is_dir() else start_path.parent
+    current = start_path if _stat_kind(start_path) == _DIR else start_path.parent
     
     # Search up the directory tree for .git directory
     while current != current.parent:
-        if (current / ".git").is_dir():
+        if _stat_kind(current / ".git") == _DIR:
             return current
         current = current.parent
     
@@ -73,20 +126,16 @@ def _find_parent_readmes(path: Path) -> List[Path]:
         List of README paths from deepest to shallowest
     """
     readmes = []
-    current = path if path.is_dir() else path.parent
+    current = path if _stat_kind(path) == _DIR else path.parent
     
-    # Find the git root to use as our boundary
-    git_root = _find_git_root(current)
-    stop_at = git_root if git_root else Path("/")
-    
-    # Collect READMEs up to the boundary
+    # Single walk upwards, stopping at the git root (or filesystem root)
     while True:
         readme_path = current / "README.md"
-        if readme_path.exists() and readme_path not in readmes:
+        if _stat_kind(readme_path) != _MISSING:
             readmes.append(readme_path)
         
-        # Stop if we've reached our boundary or can't go higher
-        if current == stop_at or current == current.parent:
+        # Stop if we've reached the repository boundary or can't go higher
+        if current == current.parent or _stat_kind(current / ".git") == _DIR:
             break
             
         current = current.parent
@@ -95,17 +144,87 @@ def _find_parent_readmes(path: Path) -> List[Path]:
     readmes.sort(key=lambda p: (len(p.parts), str(p)))
     return readmes
 
+class _CompiledGitignore:
+    """
+    Gitignore rules classified and compiled once, so matching a path is a
+    handful of C-level calls instead of a per-rule fnmatch loop.
+    """
+
+    def __init__(self, rules: List[str]):
+        dir_prefixes = []
+        literals = []
+        path_patterns = []
+
+        for rule in rules:
+            rule = rule.strip()
+            if not rule or rule.startswith("#"):
+                continue
+
+            # If the rule contains a slash, treat it as relative to the project_dir.
+            if "/" in rule:
+                if rule.startswith("/"):
+                    pattern = rule.lstrip("/")
+                    # Anchored rules ending with a slash match directory prefixes.
+                    if rule.endswith("/"):
+                        dir_prefixes.append(pattern)
+                    else:
+                        path_patterns.append(fnmatch.translate(pattern))
+                else:
+                    # Rule with a slash but not anchored; match against the entire relative path.
+                    path_patterns.append(fnmatch.translate(rule))
+                continue
+
+            # Rules without a slash match anywhere in rel_path. Since rel_path ends
+            # with the basename, that also covers matching the basename itself, and
+            # globs like "*.pyc" reduce to the plain substring ".pyc".
+            core = rule.strip("*")
+            if core and not any(ch in core for ch in "*?[]"):
+                literals.append(core)
+            else:
+                path_patterns.append(fnmatch.translate(f"*{rule}*"))
+
+        self._dir_prefixes = tuple(dir_prefixes)
+        # All literal rules are checked in one regex scan of the path
+        self._literal_regex = re.compile("|".join(re.escape(lit) for lit in literals)) if literals else None
+        self._path_regex = _compile_alternation(path_patterns)
+
+    def match(self, rel_path: str) -> bool:
+        """Return True if any rule ignores the given relative path."""
+        if self._dir_prefixes and rel_path.startswith(self._dir_prefixes):
+            return True
+        if self._literal_regex and self._literal_regex.search(rel_path):
+            return True
+        return bool(self._path_regex and self._path_regex.match(rel_path))
+
+def _compile_alternation(patterns: List[str]) -> Optional[re.Pattern]:
+    """Combine translated fnmatch patterns into a single regex."""
+    if not patterns:
+        return None
+    return re.compile("|".join(f"(?:{p})" for p in patterns))
+
 def _should_ignore(
     path: Path,
-    gitignore_rules: List[str],
+    gitignore_rules: Union[List[str], _CompiledGitignore],
     root_dir: Path,
     extensions: Optional[Tuple[str, ...]] = None
 ) -> bool:
+    if not isinstance(gitignore_rules, _CompiledGitignore):
+        gitignore_rules = _CompiledGitignore(gitignore_rules)
+    extensions = tuple(extensions) if extensions else None
     rel_path = os.path.relpath(str(path), root_dir)
-    basename = path.name
-
+    is_file = bool(extensions) and _stat_kind(path) == _FILE
+    return _should_ignore_name(path.name, rel_path, is_file, gitignore_rules, extensions)
+
+def _should_ignore_name(
+    basename: str,
+    rel_path: str,
+    is_file: bool,
+    matcher: _CompiledGitignore,
+    extensions: Optional[Tuple[str, ...]] = None
+) -> bool:
+    """Decide whether to skip an entry given its name and path relative to the gitignore root."""
     # Always skip binary or data files
-    if _is_binary_path(path) or _is_data_path(path):
+    if _is_binary_name(basename) or _is_data_name(basename):
         return True
 
     # Always include README.md
@@ -113,75 +232,50 @@ def _should_ignore(
         return False
 
     # If filtering by extension for files, and this file doesn’t match, ignore it.
-    if extensions and path.is_file() and not any(path.name.endswith(ext) for ext in extensions):
+    if extensions and is_file and not basename.endswith(extensions):
         return True
 
-    for rule in gitignore_rules:
-        rule = rule.strip()
-        if not rule or rule.startswith("#"):
-            continue
-
-        # If the rule contains a slash, treat it as relative to the project_dir.
-        if "/" in rule:
-            # For rules starting with a slash, strip it and check if rel_path starts with the pattern.
-            if rule.startswith("/"):
-                pattern = rule.lstrip("/")
-                # If rule ends with a slash, match directory prefixes.
-                if rule.endswith("/"):
-                    if rel_path.startswith(pattern):
-                        return True
-                else:
-                    # Use fnmatch to allow wildcards.
-                    if fnmatch.fnmatch(rel_path, pattern):
-                        return True
-            else:
-                # Rule with a slash but not anchored; apply fnmatch against the entire relative path.
-                if fnmatch.fnmatch(rel_path, rule):
-                    return True
-        else:
-            # For rules without a slash:
-            # If the rule appears as a glob pattern, match against basename and anywhere in rel_path.
-            if any(ch in rule for ch in "*?[]"):
-                if fnmatch.fnmatch(basename, rule) or fnmatch.fnmatch(rel_path, f"*{rule}*"):
-                    return True
-            else:
-                # Plain string: if the rule appears anywhere in basename or rel_path, ignore.
-                if rule in basename or rule in rel_path:
-                    return True
-    return False
-
-def _is_binary_path(path: Path) -> bool:
-    """Check if a file path likely contains binary content."""
-    binary_extensions = {
-        '.pyc', '.pyo', '.pyd', '.so', '.dll', '.dylib',
-        '.exe', '.bin', '.pkl', '.pickle', '.wandb',
-        '.zip', '.tar', '.gz', '.jpg', '.png', '.gif'
-    }
-    return any(path.name.endswith(ext) for ext in binary_extensions)
-
-def _is_data_path(path: Path) -> bool:
-    """Check if a file path likely contains data content rather than source code."""
-    data_extensions = {'.log', '.txt'}
-    return any(path.name.endswith(ext) for ext in data_extensions)
+    return matcher.match(rel_path)
+
+def _is_binary_name(name: str) -> bool:
+    """Check if a file name likely refers to binary content."""
+    return os.path.splitext(name)[1].lower() in _BINARY_EXTENSIONS
+
+def _is_data_name(name: str) -> bool:
+    """Check if a file name likely refers to data content rather than source code."""
+    return os.path.splitext(name)[1].lower() in _DATA_EXTENSIONS
 
 
 def _load_file(
-    path: Path,
+    path: Union[str, Path],
     index: int,
-    processed_files: Set[Path],
+    processed_files: Set[str],
 ) -> Optional[Document]:
     """Load a single file into a Document if it meets criteria."""
-    if path in processed_files:
+    source = os.fspath(path)
+    if source in processed_files:
         return None
 
     try:
-        with open(path, "r", encoding='utf-8') as f:
-            return Document(
-                index=index,
-                source=str(path),
-                content=f.read(),
-                is_readme=path.name.endswith("README.md")
-            )
+        with open(source, "rb") as f:
+            # Same heuristic as git: a NUL byte near the start means binary
+            head = f.read(_BINARY_SNIFF_BYTES)
+            if b"\x00" in head:
+                logger.debug("Skipping binary file %s", path)
+                return None
+            data = head + f.read()
+
+        # One decode, rather than text mode's incremental decoder
+        content = data.decode("utf-8")
+        # Keep text mode's universal newline handling
+        if "\r" in content:
+            content = content.replace("\r\n", "\n").replace("\r", "\n")
+        return Document(
+            index=index,
+            source=source,
+            content=content,
+            is_readme=source.endswith("README.md")
+        )
     except UnicodeDecodeError:
         logger.warning(f"Skipping file {path} due to UnicodeDecodeError")
         return None
@@ -193,88 +287,130 @@ def _matches_extensions(path: Path, extensions: Optional[Tuple[str, ...]] = None
     """Check if a file path matches any of the given extensions."""
     if extensions is None or len(extensions) == 0:
         return True
-    logger.info(f"Checking if {path} matches extensions {extensions}")
-    logger.debug(f"Any extensions match? {any(path.name.endswith(ext) for ext in extensions)}")
-    return path.name.endswith("README.md") or any(path.name.endswith(ext) for ext in extensions)
+    matches = path.name.endswith(("README.md", *extensions))
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Extension match for %s against %s: %s", path, extensions, matches)
+    return matches
+
+def _entry_is_dir(entry: os.DirEntry) -> bool:
+    try:
+        return entry.is_dir()
+    except OSError:
+        return False
+
+def _entry_is_file(entry: os.DirEntry) -> bool:
+    try:
+        return entry.is_file()
+    except OSError:
+        return False
 
 def _collect_files(
     path: Path,
-    gitignore_rules: List[str],
-    processed_files: Set[Path],
+    gitignore_rules: Union[List[str], _CompiledGitignore],
+    processed_files: Set[str],
     next_index: int,
     extensions: Optional[Tuple[str, ...]] = None
 ) -> List[Document]:
     """Recursively collect files into Document objects."""
-    documents = []
-    current_index = next_index
     path_obj = Path(path)
-    gitignore_root = str(path_obj if path_obj.is_dir() else path_obj.parent)
-
-    def process_file(file_path: Path) -> None:
-        nonlocal current_index
-        if doc := _load_file(file_path, current_index, processed_files):
-            documents.append(doc)
-            processed_files.add(file_path)
-            current_index += 1
+    path_kind = _stat_kind(path_obj)
+    gitignore_root = str(path_obj if path_kind == _DIR else path_obj.parent)
+    if isinstance(gitignore_rules, _CompiledGitignore):
+        matcher = gitignore_rules
+    else:
+        matcher = _CompiledGitignore(gitignore_rules)
+    file_paths: List[str] = []
 
-    if path_obj.is_file():
-        if not _should_ignore(path_obj, gitignore_rules, gitignore_root, extensions):
-            process_file(path_obj)
+    if path_kind == _FILE:
+        if not _should_ignore(path_obj, matcher, gitignore_root, extensions):
+            file_paths.append(str(path_obj))
     
-    elif path_obj.is_dir():
-        for root, dirs, files in os.walk(path_obj):
-            dirs[:] = [d for d in dirs if not d.startswith(".")]
-            files = [f for f in files if not f.startswith(".")]
+    elif path_kind == _DIR:
+        # Depth-first walk with os.scandir so DirEntry type info avoids extra stats.
+        # Like os.walk, symlinked directories are listed but not descended into.
+        # Each stack item carries its path relative to the walk root, so relative
+        # paths are built by concatenation rather than os.path.relpath.
+        stack = [(str(path_obj), "")]
+        while stack:
+            dir_path, rel_dir = stack.pop()
+            try:
+                it = os.scandir(dir_path)
+            except OSError:
+                continue
 
-            dirs[:] = [d for d in dirs if not _should_ignore(Path(os.path.join(root, d)), gitignore_rules, gitignore_root, extensions)]
-            files = [f for f in files if not _should_ignore(Path(os.path.join(root, f)), gitignore_rules, gitignore_root, extensions)]
+            with it:
+                for entry in it:
+                    name = entry.name
+                    if name.startswith("."):
+                        continue
+
+                    rel_path = rel_dir + name
+                    if _entry_is_dir(entry):
+                        if not _should_ignore_name(name, rel_path, False, matcher, extensions) and not entry.is_symlink():
+                            stack.append((entry.path, rel_path + os.sep))
+                    elif not _should_ignore_name(name, rel_path, _entry_is_file(entry), matcher, extensions):
+                        file_paths.append(entry.path)
+
+    # Walk order is arbitrary; get_context sorts the final documents
+    return _load_files_batch(file_paths, next_index, processed_files)
+
+def _load_files_batch(
+    paths: List[str],
+    start_index: int,
+    processed_files: Set[str],
+) -> List[Document]:
+    """Load the given files into Documents, numbering them from start_index."""
+    pending = [path for path in paths if path not in processed_files]
 
-            for file_name in sorted(files):
-                process_file(Path(os.path.join(root, file_name)))
+    # Reads are I/O bound and release the GIL, so overlap them across threads
+    if len(pending) >= _PARALLEL_READ_THRESHOLD:
+        with ThreadPoolExecutor(max_workers=min(_READ_WORKERS, len(pending))) as pool:
+            loaded = list(pool.map(lambda p: _load_file(p, 0, processed_files), pending))
+    else:
+        loaded = [_load_file(path, 0, processed_files) for path in pending]
 
+    # Number documents in walk order once all reads have finished
+    documents = []
+    for path, doc in zip(pending, loaded):
+        if doc:
+            doc.index = start_index + len(documents)
+            documents.append(doc)
+            processed_files.add(path)
     return documents
 
 def _read_gitignore(path: str) -> List[str]:
     """Return lines from .gitignore for ignoring certain files/directories."""
-    if os.path.isfile(path):
-        try:
-            with open(path, "r") as f:
-                return [line.strip() for line in f if line.strip() and not line.startswith("#")]
-        except Exception:
-            return []
-    return []
-
-def _format_document(doc: Document, raw: bool) -> str:
-    """Format a document according to output format."""
+    # Just try to open it: a missing file or a directory fails here, saving a stat
+    try:
+        with open(path, "r") as f:
+            return [line.strip() for line in f if line.strip() and not line.startswith("#")]
+    except Exception:
+        return []
+
+def _format_document(doc: Document, raw: bool, out: List[str]) -> None:
+    """Append a document's output lines, formatted according to output format."""
     if raw:
-        lines = [doc.source, "---"]
+        out.append(doc.source)
+        out.append("---")
         if doc.is_readme:
-            lines.append("### README START ###")
-        lines.append(doc.content)
+            out.append("### README START ###")
+        out.append(doc.content)
         if doc.is_readme:
-            lines.append("### README END ###")
-        lines.append("---")
+            out.append("### README END ###")
+        out.append("---")
     else:
-        lines = [
-            f'<document index="{doc.index}">',
-            f"<source>{doc.source}</source>"
-        ]
+        out.append(f'<document index="{doc.index}">')
+        out.append(f"<source>{doc.source}</source>")
         if doc.is_readme:
-            lines.extend([
-                "<type>readme</type>",
-                "<instructions>",
-                doc.content,
-                "</instructions>"
-            ])
+            out.append("<type>readme</type>")
+            out.append("<instructions>")
+            out.append(doc.content)
+            out.append("</instructions>")
         else:
-            lines.extend([
-                "<document_content>",
-                doc.content,
-                "</document_content>"
-            ])
-        lines.append("</document>")
-    
-    return "\n".join(lines)
+            out.append("<document_content>")
+            out.append(doc.content)
+            out.append("</document_content>")
+        out.append("</document>")
 
 def get_context(
     paths: Optional[List[Union[str, Path]]],
@@ -297,57 +433,70 @@ def get_context(
     if not paths:
         return "" if raw else "<documents></documents>"
 
+    # str.endswith accepts a tuple and scans it in C
+    extensions = tuple(extensions) if extensions else None
+
     processed_files: Set[str] = set()
+    # Compiled once per .gitignore, shared by inputs in the same directory
+    gitignore_matchers: Dict[str, _CompiledGitignore] = {}
     documents = []
     next_index = 1
 
-    for path_str in paths:
-        try:
-            # Resolve path relative to current directory
-            path = resolve_codebase_path(path_str)
+    with _stat_cache_scope():
+        for path_str in paths:
+            try:
+                # Resolve path relative to current directory
+                path = resolve_codebase_path(path_str)
             
-            if not path.exists():
-                logger.warning(f"Path does not exist: {path}")
-                continue
-
-            # Process parent READMEs first
-            for readme_path in _find_parent_readmes(path):
-                if doc := _load_file(readme_path, next_index, processed_files):
-                    documents.append(doc)
-                    processed_files.add(readme_path)
-                    next_index += 1
-
-            # Process requested path
-            gitignore_dir = path if path.is_dir() else path.parent
-            gitignore_path = gitignore_dir / ".gitignore"
-            gitignore_rules = _read_gitignore(str(gitignore_path))
-            new_docs = _collect_files(
-                path,
-                gitignore_rules,
-                processed_files,
-                next_index,
-                extensions
-            )
-            next_index += len(new_docs)
-            documents.extend(new_docs)
-
-        except Exception as e:
-            print(f"Error processing path {path_str}: {e}")
-
-    # Sort documents (READMEs first, then by path)
-    documents.sort(key=lambda d: (not d.is_readme, d.source))
+                if _stat_kind(path) == _MISSING:
+                    logger.warning(f"Path does not exist: {path}")
+                    continue
+
+                # Process parent READMEs first
+                for readme_path in _find_parent_readmes(path):
+                    if doc := _load_file(readme_path, next_index, processed_files):
+                        documents.append(doc)
+                        processed_files.add(doc.source)
+                        next_index += 1
+
+                # Process requested path
+                gitignore_dir = path if _stat_kind(path) == _DIR else path.parent
+                gitignore_path = str(gitignore_dir / ".gitignore")
+                if gitignore_path not in gitignore_matchers:
+                    gitignore_matchers[gitignore_path] = _CompiledGitignore(_read_gitignore(gitignore_path))
+                new_docs = _collect_files(
+                    path,
+                    gitignore_matchers[gitignore_path],
+                    processed_files,
+                    next_index,
+                    extensions
+                )
+                next_index += len(new_docs)
+                documents.extend(new_docs)
+
+            except Exception as e:
+                print(f"Error processing path {path_str}: {e}")
+
+    # Sort documents (READMEs first, then by path). Partitioning first lets each
+    # half sort on the bare source string instead of building a key tuple per document.
+    by_source = attrgetter("source")
+    readme_docs = [doc for doc in documents if doc.is_readme]
+    other_docs = [doc for doc in documents if not doc.is_readme]
+    readme_docs.sort(key=by_source)
+    other_docs.sort(key=by_source)
+    documents = readme_docs + other_docs
 
     # Re-index documents
     for i, doc in enumerate(documents, 1):
         doc.index = i
 
-    # Generate output
-    output_lines = []
+    # Generate output as one flat list of lines, joined once
+    output_lines: List[str] = []
     if not raw:
         output_lines.append("<documents>")
     
     for doc in documents:
-        output_lines.append(_format_document(doc, raw))
+        _format_document(doc, raw, output_lines)
     
     if not raw:
         output_lines.append("</documents>")
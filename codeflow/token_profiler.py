@@ -2,7 +2,6 @@
 Token profiling functionality with integrated flame graph generation and proper common prefix handling
 """
 
-import tiktoken
 import re
 import logging
 import os
@@ -13,6 +12,8 @@ from typing import Dict, List, Optional, Tuple, Union, Set, Any
 
 from codeflow.file import get_context
 
+logger = logging.getLogger(__name__)
+
 @dataclass 
 class TokenNode:
     """Node for tracking token counts in a hierarchy."""
@@ -37,7 +38,8 @@ class TokenProfiler:
     """Profiles token distribution across files and directories."""
     
     def __init__(self):
-        self.encoding = tiktoken.get_encoding("cl100k_base")
+        # Loaded on first use; importing tiktoken and loading the encoding is slow
+        self._encoding = None
         # Cache nodes by full path
         self.node_cache: Dict[str, TokenNode] = {}
         # Track file types
@@ -46,9 +48,23 @@ class TokenProfiler:
         # Store paths for common prefix calculation
         self.file_paths: List[str] = []
         
+    @property
+    def encoding(self):
+        """Token encoding, created the first time it is needed."""
+        if self._encoding is None:
+            import tiktoken
+            self._encoding = tiktoken.get_encoding("cl100k_base")
+        return self._encoding
+
     def count_tokens(self, content: str) -> int:
         """Count tokens in content using configured encoding."""
-        return len(self.encoding.encode(content))
+        # Source files may legitimately contain special-token text such as
+        # <|endoftext|>; count it as ordinary text rather than raising.
+        return len(self.encoding.encode_ordinary(content))
+
+    def count_tokens_batch(self, contents: List[str]) -> List[int]:
+        """Count tokens for many contents at once using tiktoken's threaded batch encoder."""
+        return [len(tokens) for tokens in self.encoding.encode_ordinary_batch(contents)]
         
     def get_or_create_node(self, path: Path) -> TokenNode:
         """Get existing node or create new one with proper hierarchy."""
@@ -69,9 +85,10 @@ class TokenProfiler:
         self.node_cache[str_path] = node
         return node
         
-    def process_file(self, filepath: Path, content: str) -> None:
+    def process_file(self, filepath: Path, content: str, token_count: Optional[int] = None) -> None:
         """Process single file and update relevant counts."""
-        token_count = self.count_tokens(content)
+        if token_count is None:
+            token_count = self.count_tokens(content)
         
         # Update directory hierarchy
         node = self.get_or_create_node(filepath.parent)
@@ -205,8 +222,10 @@ def profile_code_context(paths: List[Union[str, Path]], raw: bool = False,
     profiler = TokenProfiler()
     paths = list(files.keys())
 
-    for filepath, content in files.items():
-        profiler.process_file(Path(filepath), content)
+    # Tokenize every file in one batched call, then attribute the counts
+    token_counts = profiler.count_tokens_batch(list(files.values()))
+    for (filepath, content), token_count in zip(files.items(), token_counts):
+        profiler.process_file(Path(filepath), content, token_count)
     
     # Find common path prefix for the title
     common_prefix = os.path.commonprefix(paths)
@@ -256,8 +275,7 @@ def generate_flamegraph(data: Dict[str, Any], output_path: str, title: str = "Fl
     total_tokens = data.get('total_tokens', 0)
     common_prefix = data.get('common_prefix', '')
     
-    logger = logging.getLogger("codeflow.token_profiler")
-    logger.debug(f"Using common prefix: {common_prefix}")
+    logger.debug("Using common prefix: %s", common_prefix)
     
     # Convert node cache to hierarchical dictionary with trimmed paths
     flame_dict = {}
@@ -276,7 +294,7 @@ def generate_flamegraph(data: Dict[str, Any], output_path: str, title: str = "Fl
             elif path_str.startswith(common_prefix):
                 path_str = path_str[len(common_prefix):]
             else:
-                logger.debug(f"Path {path_str} doesn't start with common prefix {common_prefix}")
+                logger.debug("Path %s doesn't start with common prefix %s", path_str, common_prefix)
         
         # Skip if empty after prefix removal
         if not path_str:
@@ -1,9 +1,12 @@
 import os
 import tempfile
+import re
 import unittest
 from pathlib import Path
+from unittest.mock import patch
 
-from codeflow.file import _read_gitignore, _should_ignore, get_context, _find_git_root, _find_parent_readmes, resolve_codebase_path
+from codeflow import file as file_module
+from codeflow.file import _read_gitignore, _should_ignore, _CompiledGitignore, get_context, _find_git_root, _find_parent_readmes, resolve_codebase_path
 
 class TestGitignoreHandling(unittest.TestCase):
     def setUp(self):
@@ -89,6 +92,13 @@ class TestGitignoreHandling(unittest.TestCase):
         self.assertFalse(_should_ignore(self.base_path / "test.py", gitignore_rules, self.base_path))
         self.assertFalse(_should_ignore(self.base_path / "subdir/nested.py", gitignore_rules, self.base_path))
         
+    def test_binary_extensions_case_insensitive(self):
+        """Test that binary and data extensions match regardless of case."""
+        self.assertTrue(_should_ignore(self.base_path / "IMAGE.PNG", [], self.base_path))
+        self.assertTrue(_should_ignore(self.base_path / "archive.tar.GZ", [], self.base_path))
+        self.assertTrue(_should_ignore(self.base_path / "NOTES.TXT", [], self.base_path))
+        self.assertFalse(_should_ignore(self.base_path / "png_utils.py", [], self.base_path))
+
     def test_readme_never_ignored(self):
         """Test that README.md files are never ignored."""
         gitignore_rules = ["*.md", "README.md"]
@@ -97,6 +107,25 @@ class TestGitignoreHandling(unittest.TestCase):
         self.assertFalse(_should_ignore(self.base_path / "README.md", gitignore_rules, self.base_path))
         self.assertFalse(_should_ignore(self.base_path / "subdir/README.md", gitignore_rules, self.base_path))
 
+    def test_compiled_gitignore_rule_kinds(self):
+        """Test that each kind of rule is honored by the compiled matcher."""
+        matcher = _CompiledGitignore(["/build/", "/top.py", "src/*.cfg", "*.pyc", "uv.lock", "# comment", ""])
+
+        # Anchored directory prefix
+        self.assertTrue(matcher.match("build/lib.py"))
+        self.assertFalse(matcher.match("src/build/lib.py"))
+        # Anchored glob against the full relative path
+        self.assertTrue(matcher.match("top.py"))
+        self.assertFalse(matcher.match("src/top.py"))
+        # Unanchored rule with a slash
+        self.assertTrue(matcher.match("src/app.cfg"))
+        # Glob without a slash matches the basename anywhere
+        self.assertTrue(matcher.match("deep/nested/mod.pyc"))
+        # Plain string matches anywhere in the path
+        self.assertTrue(matcher.match("sub/uv.lock"))
+        # Comments and blank lines are not rules
+        self.assertFalse(matcher.match("main.py"))
+
     def test_gitignore_with_lock_file(self):
         """Test that lock files in gitignore are properly ignored."""
         # Create a test directory with .gitignore containing uv.lock
@@ -122,6 +151,15 @@ class TestGitignoreHandling(unittest.TestCase):
         # Test that uv.lock should be ignored
         self.assertTrue(_should_ignore(lock_file, gitignore_rules, test_dir))
 
+    def test_binary_content_skipped(self):
+        """Test that files containing NUL bytes are skipped regardless of extension."""
+        (self.base_path / "blob.dat").write_bytes(b"\x7fELF\x02\x01\x00\x00binary")
+        (self.base_path / "notes.md").write_text("plain text\n")
+
+        output = get_context([str(self.base_path)])
+        self.assertNotIn("blob.dat", output)
+        self.assertIn("notes.md", output)
+
     def test_read_gitignore_with_directory_path(self):
         """Test that _read_gitignore fails when given a directory path instead of file path."""
         # This test demonstrates the bug: _read_gitignore expects a file path
@@ -230,6 +268,46 @@ class TestGitRootAndReadmeHandling(unittest.TestCase):
         self.assertTrue(any("project/src/README.md" in str(r) for r in readmes))
 
 
+class TestBatchLoading(unittest.TestCase):
+    """Test cases for loading many files through the threaded batch reader."""
+
+    def setUp(self):
+        self.test_dir = tempfile.TemporaryDirectory()
+        self.base_path = Path(self.test_dir.name).resolve()
+        # Bound the parent README search to this directory
+        (self.base_path / ".git").mkdir()
+        (self.base_path / "README.md").write_text("# Root\n")
+
+    def tearDown(self):
+        self.test_dir.cleanup()
+
+    def test_parallel_load_indices_and_dedup(self):
+        """Test that a directory above the pool threshold loads in order without duplicates."""
+        src = self.base_path / "src"
+        src.mkdir()
+        for i in range(10):
+            (src / f"mod_{9 - i}.py").write_text(f"value = {i}\n")
+        # Undecodable but NUL-free, so it fails at decode time on a worker
+        (src / "bad.py").write_bytes(b"\xff\xfe\xfa not utf-8\n")
+
+        with patch.object(file_module, "ThreadPoolExecutor", wraps=file_module.ThreadPoolExecutor) as pool:
+            # The same file is passed on its own first, then again via its directory
+            output = get_context([str(src / "mod_3.py"), str(src)])
+        pool.assert_called()
+
+        sources = re.findall(r"<source>(.*?)</source>", output)
+        indices = [int(i) for i in re.findall(r'<document index="(\d+)">', output)]
+
+        # README first, then every decodable file exactly once, sorted by path
+        expected = [str(self.base_path / "README.md")] + sorted(str(src / f"mod_{i}.py") for i in range(10))
+        self.assertEqual(sources, expected)
+        self.assertEqual(len(sources), len(set(sources)))
+        self.assertNotIn("bad.py", output)
+
+        # Indices are contiguous after skipped files
+        self.assertEqual(indices, list(range(1, len(sources) + 1)))
+
+
 class TestPathResolution(unittest.TestCase):
     """Test cases for path resolution relative to pwd."""
 
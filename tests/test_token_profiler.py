@@ -8,7 +8,19 @@ from pathlib import Path
 import tempfile
 from unittest.mock import patch, MagicMock
 
-from codeflow.token_profiler import TokenProfiler
+import tiktoken.core
+
+from codeflow.token_profiler import TokenProfiler, profile_code_context
+
+
+def _stub_encoding():
+    """Byte-level encoding with one special token, built without any download."""
+    return tiktoken.core.Encoding(
+        name="stub",
+        pat_str=r"\S+|\s+",
+        mergeable_ranks={bytes([i]): i for i in range(256)},
+        special_tokens={"<|endoftext|>": 256},
+    )
 
 class TestTokenProfiler(unittest.TestCase):
     """Test cases for the TokenProfiler class."""
@@ -26,7 +38,55 @@ class TestTokenProfiler(unittest.TestCase):
         
         # Check that the path was stored
         self.assertIn(str(file_path.parent), profiler.file_paths)
-    
+
+    @patch("tiktoken.get_encoding")
+    def test_encoding_loaded_lazily(self, mock_get_encoding):
+        """Test that the tiktoken encoding is only loaded when tokens are counted."""
+        profiler = TokenProfiler()
+        mock_get_encoding.assert_not_called()
+
+        mock_get_encoding.return_value.encode_ordinary_batch.return_value = [[1, 2, 3], [4]]
+        self.assertEqual(profiler.count_tokens_batch(["a b c", "d"]), [3, 1])
+        self.assertEqual(profiler.count_tokens_batch(["a b c", "d"]), [3, 1])
+
+        # Encoding is created once and reused
+        mock_get_encoding.assert_called_once_with("cl100k_base")
+
+    def test_special_token_text_counted_as_ordinary(self):
+        """Test that special-token text in file content is counted rather than rejected."""
+        profiler = TokenProfiler()
+        profiler._encoding = _stub_encoding()
+        content = "a <|endoftext|> b"
+
+        # Plain encode() rejects the special token...
+        with self.assertRaises(ValueError):
+            profiler.encoding.encode(content)
+
+        # ...while counting treats it as ordinary bytes
+        self.assertEqual(profiler.count_tokens(content), len(content.encode("utf-8")))
+        self.assertEqual(profiler.count_tokens_batch([content, "xy"]), [len(content), 2])
+
+    def test_profile_totals_use_batch_counts(self):
+        """Test that profile_code_context totals come from count_tokens_batch."""
+        with tempfile.TemporaryDirectory() as tmp:
+            base = Path(tmp).resolve()
+            (base / ".git").mkdir()
+            for name in ("a.py", "b.py", "c.py"):
+                (base / name).write_text(f"# {name}\n")
+
+            returned = []
+
+            def fake_batch(contents):
+                counts = [10 * (i + 1) for i in range(len(contents))]
+                returned.extend(counts)
+                return counts
+
+            with patch.object(TokenProfiler, "count_tokens_batch", side_effect=fake_batch), \
+                 patch.object(TokenProfiler, "count_tokens", side_effect=AssertionError("per-file count")):
+                _, profile_data = profile_code_context([str(base)])
+
+        self.assertEqual(len(returned), 3)
+        self.assertEqual(profile_data["total_tokens"], sum(returned))
 
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file